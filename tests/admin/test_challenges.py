@@ -1,95 +1,81 @@
-from CTFd.models import Challenges
-from CTFd.utils import set_config
-from tests.helpers import (
-    create_ctfd,
-    destroy_ctfd,
-    gen_challenge,
-    gen_flag,
-    login_as_user,
-    register_user,
-)
-
-
-def test_create_new_challenge():
-    """Test that an admin can create a challenge properly"""
-    app = create_ctfd()
-    with app.app_context():
-        register_user(app)
-        client = login_as_user(app, name="admin", password="password")
-
-        challenge_data = {
-            "name": "name",
-            "category": "category",
-            "description": "description",
-            "value": 100,
-            "state": "hidden",
-            "type": "standard",
-        }
-
-        r = client.post("/api/v1/challenges", json=challenge_data)
-        assert r.get_json().get("data")["id"] == 1
-        r = client.get("/admin/challenges/1")
-        assert r.status_code == 200
-        r = client.get("/api/v1/challenges/1")
-        assert r.get_json().get("data")["id"] == 1
-
-    destroy_ctfd(app)
-
-
-def test_hidden_challenge_is_reachable():
-    """Test that hidden challenges are visible for admins"""
-    app = create_ctfd()
-    with app.app_context():
-        register_user(app)
-        client = login_as_user(app, name="admin", password="password")
-        chal = gen_challenge(app.db, state="hidden")
-        gen_flag(app.db, challenge_id=chal.id, content="flag")
-        chal_id = chal.id
+import pytest
+
+from tests.helpers import gen_challenge, gen_flag, login_as_user, register_user
 
-        assert Challenges.query.count() == 1
 
-        r = client.get("/api/v1/challenges", json="")
-        data = r.get_json().get("data")
-        assert data == []
+def test_create_new_challenge(clean_db, admin_client):
+    """Test that an admin can create a challenge properly"""
+    app = clean_db
+    register_user(app)
+    client = admin_client
+
+    challenge_data = {
+        "name": "name",
+        "category": "category",
+        "description": "description",
+        "value": 100,
+        "state": "hidden",
+        "type": "standard",
+    }
+
+    r = client.post("/api/v1/challenges", json=challenge_data)
+    body = r.get_json()["data"]
+    challenge_id = body["id"]
+    r = client.get("/admin/challenges/{}".format(challenge_id))
+    assert r.status_code == 200
+    r = client.get("/api/v1/challenges/{}".format(challenge_id))
+    final_body = r.get_json()["data"]
+    assert final_body["id"] == challenge_id
+
+
+def test_hidden_challenge_is_reachable(clean_db, admin_client):
+    """Test that hidden challenges are visible for admins"""
+    app = clean_db
+    register_user(app)
+    client = admin_client
+    chal = gen_challenge(app.db, state="hidden")
+    gen_flag(app.db, challenge_id=chal.id, content="flag")
+    chal_id = chal.id
 
-        r = client.get("/api/v1/challenges/1", json="")
-        assert r.status_code == 200
-        data = r.get_json().get("data")
-        assert data["name"] == "chal_name"
+    r = client.get("/api/v1/challenges", json="")
+    data = r.get_json().get("data")
+    assert data == []
 
-        data = {"submission": "flag", "challenge_id": chal_id}
+    r = client.get("/api/v1/challenges/{}".format(chal_id), json="")
+    assert r.status_code == 200
+    data = r.get_json().get("data")
+    assert data["name"] == "chal_name"
 
-        r = client.post("/api/v1/challenges/attempt", json=data)
-        assert r.status_code == 404
+    data = {"submission": "flag", "challenge_id": chal_id}
 
-        r = client.post("/api/v1/challenges/attempt?preview=true", json=data)
-        assert r.status_code == 200
-        resp = r.get_json()["data"]
-        assert resp.get("status") == "correct"
-    destroy_ctfd(app)
+    r = client.post("/api/v1/challenges/attempt", json=data)
+    assert r.status_code == 404
 
+    r = client.post("/api/v1/challenges/attempt?preview=true", json=data)
+    assert r.status_code == 200
+    resp = r.get_json()["data"]
+    assert resp.get("status") == "correct"
 
-def test_challenges_admin_only_as_user():
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "admins")
 
-        register_user(app)
-        client = login_as_user(app)
+@pytest.mark.parametrize("challenge_visibility", ["admins"], indirect=True)
+def test_challenges_admin_only_as_user(clean_db, challenge_visibility):
+    app = clean_db
+    register_user(app)
+    client = login_as_user(app)
 
-        gen_challenge(app.db)
-        gen_flag(app.db, challenge_id=1, content="flag")
+    chal = gen_challenge(app.db)
+    chal_id = chal.id
+    gen_flag(app.db, challenge_id=chal_id, content="flag")
 
-        r = client.get("/challenges")
-        assert r.status_code == 403
+    r = client.get("/challenges")
+    assert r.status_code == 403
 
-        r = client.get("/api/v1/challenges", json="")
-        assert r.status_code == 403
+    r = client.get("/api/v1/challenges", json="")
+    assert r.status_code == 403
 
-        r = client.get("/api/v1/challenges/1", json="")
-        assert r.status_code == 403
+    r = client.get("/api/v1/challenges/{}".format(chal_id), json="")
+    assert r.status_code == 403
 
-        data = {"submission": "flag", "challenge_id": 1}
-        r = client.post("/api/v1/challenges/attempt", json=data)
-        assert r.status_code == 403
-    destroy_ctfd(app)
+    data = {"submission": "flag", "challenge_id": chal_id}
+    r = client.post("/api/v1/challenges/attempt", json=data)
+    assert r.status_code == 403
@@ -1,5 +1,7 @@
 import random
 
+import pytest
+
 from CTFd.models import (
     Awards,
     Challenges,
@@ -18,6 +20,7 @@ from CTFd.models import (
     Users,
 )
 from tests.helpers import (
+    count_rows,
     create_ctfd,
     destroy_ctfd,
     gen_award,
@@ -26,6 +29,7 @@ from tests.helpers import (
     gen_file,
     gen_flag,
     gen_hint,
+    gen_reset_data,
     gen_solve,
     gen_team,
     gen_tracking,
@@ -34,107 +38,96 @@ from tests.helpers import (
 )
 
 
+@pytest.mark.slow
 def test_reset():
     app = create_ctfd()
     with app.app_context():
-        base_user = "user"
+        gen_reset_data(app.db)
 
-        for x in range(10):
-            chal = gen_challenge(app.db, name="chal_name{}".format(x))
-            gen_flag(app.db, challenge_id=chal.id, content="flag")
-            gen_hint(app.db, challenge_id=chal.id)
-            gen_file(
-                app.db,
-                location="{name}/{name}.file".format(name=chal.name),
-                challenge_id=chal.id,
-            )
-
-        for x in range(10):
-            user = base_user + str(x)
-            user_email = user + "@examplectf.com"
-            user_obj = gen_user(app.db, name=user, email=user_email)
-            gen_award(app.db, user_id=user_obj.id)
-            gen_solve(app.db, user_id=user_obj.id, challenge_id=random.randint(1, 10))
-            gen_fail(app.db, user_id=user_obj.id, challenge_id=random.randint(1, 10))
-            gen_tracking(app.db, user_id=user_obj.id)
-
-        # Add PageFiles
-        for x in range(5):
-            gen_file(
-                app.db,
-                location="page_file{name}/page_file{name}.file".format(name=x),
-                page_id=1,
-            )
-
-        assert Users.query.count() == 11  # 11 because of the first admin user
-        assert Challenges.query.count() == 10
-        assert (
-            Files.query.count() == 15
-        )  # This should be 11 because ChallengeFiles=10 and PageFiles=5
-        assert Flags.query.count() == 10
-        assert Hints.query.count() == 10
-        assert Submissions.query.count() == 20
-        assert Pages.query.count() == 1
-        assert Tracking.query.count() == 10
+        assert count_rows(
+            Users, Challenges, Files, Flags, Hints, Submissions, Pages, Tracking
+        ) == {
+            "Users": 11,  # 11 because of the first admin user
+            "Challenges": 10,
+            "Files": 15,  # ChallengeFiles=10 and PageFiles=5
+            "Flags": 10,
+            "Hints": 10,
+            "Submissions": 20,
+            "Pages": 1,
+            "Tracking": 10,
+        }
 
         client = login_as_user(app, name="admin", password="password")
-
         with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "pages": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Pages.query.count() == 0
-        assert Users.query.count() == 11
-        assert Challenges.query.count() == 10
-        assert Tracking.query.count() == 11
-        assert Files.query.count() == 10
+            nonce = sess.get("nonce")
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "notifications": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Notifications.query.count() == 0
-        assert Users.query.count() == 11
-        assert Challenges.query.count() == 10
-        assert Tracking.query.count() == 11
+        r = client.post("/admin/reset", data={"nonce": nonce, "pages": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(Pages, Users, Challenges, Tracking, Files) == {
+            "Pages": 0,
+            "Users": 11,
+            "Challenges": 10,
+            "Tracking": 11,
+            "Files": 10,
+        }
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "challenges": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Challenges.query.count() == 0
-        assert Flags.query.count() == 0
-        assert Hints.query.count() == 0
-        assert Files.query.count() == 0
-        assert Tags.query.count() == 0
-        assert Users.query.count() == 11
-        assert Tracking.query.count() == 11
+        r = client.post("/admin/reset", data={"nonce": nonce, "notifications": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(Notifications, Users, Challenges, Tracking) == {
+            "Notifications": 0,
+            "Users": 11,
+            "Challenges": 10,
+            "Tracking": 11,
+        }
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "submissions": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Submissions.query.count() == 0
-        assert Solves.query.count() == 0
-        assert Fails.query.count() == 0
-        assert Awards.query.count() == 0
-        assert Unlocks.query.count() == 0
-        assert Users.query.count() == 11
-        assert Challenges.query.count() == 0
-        assert Flags.query.count() == 0
-        assert Tracking.query.count() == 0
+        r = client.post("/admin/reset", data={"nonce": nonce, "challenges": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(Challenges, Flags, Hints, Files, Tags, Users, Tracking) == {
+            "Challenges": 0,
+            "Flags": 0,
+            "Hints": 0,
+            "Files": 0,
+            "Tags": 0,
+            "Users": 11,
+            "Tracking": 11,
+        }
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "accounts": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/setup")
-        assert Users.query.count() == 0
-        assert Solves.query.count() == 0
-        assert Fails.query.count() == 0
-        assert Tracking.query.count() == 0
+        r = client.post("/admin/reset", data={"nonce": nonce, "submissions": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(
+            Submissions,
+            Solves,
+            Fails,
+            Awards,
+            Unlocks,
+            Users,
+            Challenges,
+            Flags,
+            Tracking,
+        ) == {
+            "Submissions": 0,
+            "Solves": 0,
+            "Fails": 0,
+            "Awards": 0,
+            "Unlocks": 0,
+            "Users": 11,
+            "Challenges": 0,
+            "Flags": 0,
+            "Tracking": 0,
+        }
+
+        r = client.post("/admin/reset", data={"nonce": nonce, "accounts": "on"})
+        assert r.location.endswith("/setup")
+        assert count_rows(Users, Solves, Fails, Tracking) == {
+            "Users": 0,
+            "Solves": 0,
+            "Fails": 0,
+            "Tracking": 0,
+        }
     destroy_ctfd(app)
 
 
+@pytest.mark.slow
 def test_reset_team_mode():
     app = create_ctfd(user_mode="teams")
     with app.app_context():
@@ -178,76 +171,93 @@ def test_reset_team_mode():
 
         assert Teams.query.count() == 10
         # 10 random users, 40 users (10 teams * 4), 1 admin user
-        assert Users.query.count() == 51
-        assert Challenges.query.count() == 10
-        assert (
-            Files.query.count() == 15
-        )  # This should be 11 because ChallengeFiles=10 and PageFiles=5
-        assert Flags.query.count() == 10
-        assert Hints.query.count() == 10
-        assert Submissions.query.count() == 20
-        assert Solves.query.count() == 10
-        assert Fails.query.count() == 10
-        assert Tracking.query.count() == 10
+        assert count_rows(
+            Users, Challenges, Files, Flags, Hints, Submissions, Solves, Fails, Tracking
+        ) == {
+            "Users": 51,
+            "Challenges": 10,
+            "Files": 15,  # ChallengeFiles=10 and PageFiles=5
+            "Flags": 10,
+            "Hints": 10,
+            "Submissions": 20,
+            "Solves": 10,
+            "Fails": 10,
+            "Tracking": 10,
+        }
 
         client = login_as_user(app, name="admin", password="password")
-
         with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "pages": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Pages.query.count() == 0
-        assert Teams.query.count() == 10
-        assert Users.query.count() == 51
-        assert Challenges.query.count() == 10
-        assert Tracking.query.count() == 11
-        assert Files.query.count() == 10
+            nonce = sess.get("nonce")
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "notifications": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Notifications.query.count() == 0
-        assert Teams.query.count() == 10
-        assert Users.query.count() == 51
-        assert Challenges.query.count() == 10
-        assert Tracking.query.count() == 11
+        r = client.post("/admin/reset", data={"nonce": nonce, "pages": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(Pages, Teams, Users, Challenges, Tracking, Files) == {
+            "Pages": 0,
+            "Teams": 10,
+            "Users": 51,
+            "Challenges": 10,
+            "Tracking": 11,
+            "Files": 10,
+        }
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "challenges": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Challenges.query.count() == 0
-        assert Flags.query.count() == 0
-        assert Hints.query.count() == 0
-        assert Files.query.count() == 0
-        assert Tags.query.count() == 0
-        assert Teams.query.count() == 10
-        assert Users.query.count() == 51
-        assert Tracking.query.count() == 11
+        r = client.post("/admin/reset", data={"nonce": nonce, "notifications": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(Notifications, Teams, Users, Challenges, Tracking) == {
+            "Notifications": 0,
+            "Teams": 10,
+            "Users": 51,
+            "Challenges": 10,
+            "Tracking": 11,
+        }
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "submissions": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/admin/statistics")
-        assert Submissions.query.count() == 0
-        assert Solves.query.count() == 0
-        assert Fails.query.count() == 0
-        assert Awards.query.count() == 0
-        assert Unlocks.query.count() == 0
-        assert Teams.query.count() == 10
-        assert Users.query.count() == 51
-        assert Challenges.query.count() == 0
-        assert Flags.query.count() == 0
-        assert Tracking.query.count() == 0
+        r = client.post("/admin/reset", data={"nonce": nonce, "challenges": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(
+            Challenges, Flags, Hints, Files, Tags, Teams, Users, Tracking
+        ) == {
+            "Challenges": 0,
+            "Flags": 0,
+            "Hints": 0,
+            "Files": 0,
+            "Tags": 0,
+            "Teams": 10,
+            "Users": 51,
+            "Tracking": 11,
+        }
 
-        with client.session_transaction() as sess:
-            data = {"nonce": sess.get("nonce"), "accounts": "on"}
-            r = client.post("/admin/reset", data=data)
-            assert r.location.endswith("/setup")
-        assert Users.query.count() == 0
-        assert Teams.query.count() == 0
-        assert Solves.query.count() == 0
-        assert Fails.query.count() == 0
-        assert Tracking.query.count() == 0
+        r = client.post("/admin/reset", data={"nonce": nonce, "submissions": "on"})
+        assert r.location.endswith("/admin/statistics")
+        assert count_rows(
+            Submissions,
+            Solves,
+            Fails,
+            Awards,
+            Unlocks,
+            Teams,
+            Users,
+            Challenges,
+            Flags,
+            Tracking,
+        ) == {
+            "Submissions": 0,
+            "Solves": 0,
+            "Fails": 0,
+            "Awards": 0,
+            "Unlocks": 0,
+            "Teams": 10,
+            "Users": 51,
+            "Challenges": 0,
+            "Flags": 0,
+            "Tracking": 0,
+        }
+
+        r = client.post("/admin/reset", data={"nonce": nonce, "accounts": "on"})
+        assert r.location.endswith("/setup")
+        assert count_rows(Users, Teams, Solves, Fails, Tracking) == {
+            "Users": 0,
+            "Teams": 0,
+            "Solves": 0,
+            "Fails": 0,
+            "Tracking": 0,
+        }
     destroy_ctfd(app)
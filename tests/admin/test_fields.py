@@ -1,94 +1,39 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from CTFd.models import Users
-from tests.helpers import (
-    create_ctfd,
-    destroy_ctfd,
-    gen_field,
-    gen_team,
-    login_as_user,
-    register_user,
-)
-
+import pytest
 
-def test_admin_view_fields():
-    app = create_ctfd()
-    with app.app_context():
-        register_user(app)
-
-        gen_field(
-            app.db, name="CustomField1", required=True, public=True, editable=True
-        )
-        gen_field(
-            app.db, name="CustomField2", required=False, public=True, editable=True
-        )
-        gen_field(
-            app.db, name="CustomField3", required=False, public=False, editable=True
-        )
-        gen_field(
-            app.db, name="CustomField4", required=False, public=False, editable=False
-        )
+from CTFd.models import Users
+from tests.helpers import gen_fields, gen_team, register_user
 
-        with login_as_user(app, name="admin") as admin:
-            # Admins should see all user fields regardless of public or editable
-            r = admin.get("/admin/users/2")
-            resp = r.get_data(as_text=True)
-            assert "CustomField1" in resp
-            assert "CustomField2" in resp
-            assert "CustomField3" in resp
-            assert "CustomField4" in resp
-    destroy_ctfd(app)
+CUSTOM_FIELDS = [
+    {"name": "CustomField1", "required": True, "public": True, "editable": True},
+    {"name": "CustomField2", "required": False, "public": True, "editable": True},
+    {"name": "CustomField3", "required": False, "public": False, "editable": True},
+    {"name": "CustomField4", "required": False, "public": False, "editable": False},
+]
 
 
-def test_admin_view_team_fields():
-    app = create_ctfd(user_mode="teams")
-    with app.app_context():
-        register_user(app)
+@pytest.mark.parametrize(
+    "field_type,fixture_name", [("user", "clean_db"), ("team", "clean_db_team_mode")]
+)
+def test_admin_view_fields(request, field_type, fixture_name, admin_client):
+    app = request.getfixturevalue(fixture_name)
+    register_user(app)
+    user = Users.query.filter_by(name="user").first()
+    url = "/admin/users/{}".format(user.id)
+    if field_type == "team":
         team = gen_team(app.db)
-        user = Users.query.filter_by(id=2).first()
         user.team_id = team.id
         app.db.session.commit()
+        url = "/admin/teams/{}".format(team.id)
 
-        gen_field(
-            app.db,
-            name="CustomField1",
-            type="team",
-            required=True,
-            public=True,
-            editable=True,
-        )
-        gen_field(
-            app.db,
-            name="CustomField2",
-            type="team",
-            required=False,
-            public=True,
-            editable=True,
-        )
-        gen_field(
-            app.db,
-            name="CustomField3",
-            type="team",
-            required=False,
-            public=False,
-            editable=True,
-        )
-        gen_field(
-            app.db,
-            name="CustomField4",
-            type="team",
-            required=False,
-            public=False,
-            editable=False,
-        )
+    gen_fields(app.db, CUSTOM_FIELDS, type=field_type)
 
-        with login_as_user(app, name="admin") as admin:
-            # Admins should see all team fields regardless of public or editable
-            r = admin.get("/admin/teams/1")
-            resp = r.get_data(as_text=True)
-            assert "CustomField1" in resp
-            assert "CustomField2" in resp
-            assert "CustomField3" in resp
-            assert "CustomField4" in resp
-    destroy_ctfd(app)
+    # Admins should see all fields regardless of public or editable
+    r = admin_client.get(url)
+    resp = r.get_data(as_text=True)
+    assert "CustomField1" in resp
+    assert "CustomField2" in resp
+    assert "CustomField3" in resp
+    assert "CustomField4" in resp
@@ -71,12 +71,10 @@ def test_admin_access():
     destroy_ctfd(app)
 
 
-def test_get_admin_as_user():
-    app = create_ctfd()
-    with app.app_context():
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/admin")
-        assert r.status_code == 302
-        assert r.location.startswith("http://localhost/login")
-    destroy_ctfd(app)
+def test_get_admin_as_user(clean_db):
+    app = clean_db
+    register_user(app)
+    client = login_as_user(app)
+    r = client.get("/admin")
+    assert r.status_code == 302
+    assert r.location.startswith("http://localhost/login")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import pytest
 from freezegun import freeze_time
 
 from CTFd.models import Challenges, Flags, Hints, Solves, Tags, Users
@@ -9,212 +10,194 @@ from tests.helpers import (
     create_ctfd,
     destroy_ctfd,
     gen_challenge,
+    gen_challenge_with_properties,
     gen_fail,
     gen_flag,
-    gen_hint,
     gen_solve,
-    gen_tag,
+    gen_solves,
     gen_team,
     gen_topic,
     gen_user,
+    gen_users,
     login_as_user,
     register_user,
+    set_configs,
 )
 
-
-def test_api_challenges_get_visibility_public():
-    """Can a public user get /api/v1/challenges if challenge_visibility is private/public"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges")
-            assert r.status_code == 200
-            set_config("challenge_visibility", "private")
-            r = client.get("/api/v1/challenges", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
-
-
-def test_api_challenges_get_ctftime_public():
-    """Can a public user get /api/v1/challenges if ctftime is over"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-7"):
-        set_config("challenge_visibility", "public")
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges")
-            assert r.status_code == 200
-            set_config(
-                "start", "1507089600"
-            )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-            set_config(
-                "end", "1507262400"
-            )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-            r = client.get("/api/v1/challenges")
-            assert r.status_code == 403
-    destroy_ctfd(app)
-
-
-def test_api_challenges_get_visibility_private():
-    """Can a private user get /api/v1/challenges if challenge_visibility is private/public"""
-    app = create_ctfd()
-    with app.app_context():
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges")
+CHALLENGE_ENDPOINTS = [
+    "/api/v1/challenges",
+    "/api/v1/challenges/1",
+    "/api/v1/challenges/1/solves",
+]
+
+
+@pytest.mark.parametrize("endpoint", CHALLENGE_ENDPOINTS)
+def test_api_challenge_get_visibility_public(clean_db, endpoint):
+    """Can a public user get challenge endpoints if challenge_visibility is private/public"""
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.get(endpoint)
         assert r.status_code == 200
-        set_config("challenge_visibility", "public")
-        r = client.get("/api/v1/challenges")
-        assert r.status_code == 200
-    destroy_ctfd(app)
+        set_config("challenge_visibility", "private")
+        r = client.get(endpoint, content_type="application/json")
+        assert r.status_code == 403
 
 
-def test_api_challenges_get_ctftime_private():
-    """Can a private user get /api/v1/challenges if ctftime is over"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-7"):
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges")
+@pytest.mark.parametrize("endpoint", CHALLENGE_ENDPOINTS)
+def test_api_challenge_get_ctftime_public(clean_db, endpoint):
+    """Can a public user get challenge endpoints if ctftime is over"""
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.get(endpoint)
         assert r.status_code == 200
-        set_config(
-            "start", "1507089600"
-        )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-        set_config(
-            "end", "1507262400"
-        )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-        r = client.get("/api/v1/challenges")
+        # The real current time is already past this end date so there's no need to freeze time
+        set_configs(
+            start="1507089600",  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
+            end="1507262400",  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
+        )
+        r = client.get(endpoint, content_type="application/json")
         assert r.status_code == 403
-    destroy_ctfd(app)
 
 
-def test_api_challenges_get_verified_emails():
+@pytest.mark.parametrize("endpoint", CHALLENGE_ENDPOINTS)
+def test_api_challenge_get_visibility_private(clean_db, private_client, endpoint):
+    """Can a private user get challenge endpoints if challenge_visibility is private/public"""
+    app = clean_db
+    gen_challenge(app.db)
+    r = private_client.get(endpoint)
+    assert r.status_code == 200
+    set_config("challenge_visibility", "public")
+    r = private_client.get(endpoint)
+    assert r.status_code == 200
+
+
+@pytest.mark.parametrize("endpoint", CHALLENGE_ENDPOINTS)
+def test_api_challenge_get_ctftime_private(clean_db, private_client, endpoint):
+    """Can a private user get challenge endpoints if ctftime is over"""
+    app = clean_db
+    gen_challenge(app.db)
+    r = private_client.get(endpoint)
+    assert r.status_code == 200
+    # The real current time is already past this end date so there's no need to freeze time
+    set_configs(
+        start="1507089600",  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
+        end="1507262400",  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
+    )
+    r = private_client.get(endpoint)
+    assert r.status_code == 403
+
+
+def test_api_challenges_get_verified_emails(clean_db, private_client):
     """Can a verified email user get /api/v1/challenges"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("verify_emails", True)
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges", json="")
-        assert r.status_code == 403
-        gen_user(
-            app.db,
-            name="user_name",
-            email="verified_user@examplectf.com",
-            password="password",
-            verified=True,
-        )
-        registered_client = login_as_user(app, "user_name", "password")
-        r = registered_client.get("/api/v1/challenges")
-        assert r.status_code == 200
-    destroy_ctfd(app)
-
-
-def test_api_challenges_post_non_admin():
+    app = clean_db
+    set_config("verify_emails", True)
+    r = private_client.get("/api/v1/challenges", content_type="application/json")
+    assert r.status_code == 403
+    gen_user(
+        app.db,
+        name="user_name",
+        email="verified_user@examplectf.com",
+        password="password",
+        verified=True,
+    )
+    registered_client = login_as_user(app, "user_name", "password")
+    r = registered_client.get("/api/v1/challenges")
+    assert r.status_code == 200
+
+
+def test_api_challenges_post_non_admin(clean_db):
     """Can a user post /api/v1/challenges if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        with app.test_client() as client:
-            r = client.post("/api/v1/challenges", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    with app.test_client() as client:
+        r = client.post("/api/v1/challenges", json="")
+        assert r.status_code == 403
 
 
-def test_api_challenges_get_admin():
+def test_api_challenges_get_admin(clean_db_team_mode, admin_client):
     """Can a user GET /api/v1/challenges if admin without team"""
-    app = create_ctfd(user_mode="teams")
-    with app.app_context():
-        gen_challenge(app.db)
-        # Admin does not have a team but should still be able to see challenges
-        user = Users.query.filter_by(id=1).first()
-        assert user.team_id is None
-        with login_as_user(app, "admin") as admin:
-            r = admin.get("/api/v1/challenges", json="")
-            assert r.status_code == 200
-            r = admin.get("/api/v1/challenges/1", json="")
-            assert r.status_code == 200
-    destroy_ctfd(app)
-
-
-def test_api_challenges_get_hidden_admin():
+    app = clean_db_team_mode
+    gen_challenge(app.db)
+    # Admin does not have a team but should still be able to see challenges
+    user = Users.query.filter_by(id=1).first()
+    assert user.team_id is None
+    r = admin_client.get("/api/v1/challenges", content_type="application/json")
+    assert r.status_code == 200
+    r = admin_client.get("/api/v1/challenges/1", content_type="application/json")
+    assert r.status_code == 200
+
+
+def test_api_challenges_get_hidden_admin(clean_db, admin_client):
     """Can an admin see hidden challenges in API list response"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db, state="hidden")
-        gen_challenge(app.db)
+    app = clean_db
+    gen_challenge(app.db, state="hidden")
+    gen_challenge(app.db)
 
-        with login_as_user(app, "admin") as admin:
-            challenges_list = admin.get("/api/v1/challenges", json="").get_json()[
-                "data"
-            ]
-            assert len(challenges_list) == 1
-            challenges_list = admin.get(
-                "/api/v1/challenges?view=admin", json=""
-            ).get_json()["data"]
-            assert len(challenges_list) == 2
-    destroy_ctfd(app)
+    challenges_list = admin_client.get(
+        "/api/v1/challenges", content_type="application/json"
+    ).get_json()["data"]
+    assert len(challenges_list) == 1
+    challenges_list = admin_client.get(
+        "/api/v1/challenges?view=admin", content_type="application/json"
+    ).get_json()["data"]
+    assert len(challenges_list) == 2
 
 
-def test_api_challenges_get_solve_status():
+def test_api_challenges_get_solve_status(clean_db, private_client):
     """Does the challenge list API show the current user's solve status?"""
-    app = create_ctfd()
-    with app.app_context():
-        chal_id = gen_challenge(app.db).id
-        register_user(app)
-        client = login_as_user(app)
-        # First request - unsolved
-        r = client.get("/api/v1/challenges")
-        assert r.status_code == 200
-        chal_data = r.get_json()["data"].pop()
-        assert chal_data["solved_by_me"] is False
-        # Solve and re-request
-        gen_solve(app.db, user_id=2, challenge_id=chal_id)
-        r = client.get("/api/v1/challenges")
-        assert r.status_code == 200
-        chal_data = r.get_json()["data"].pop()
-        assert chal_data["solved_by_me"] is True
-    destroy_ctfd(app)
-
-
-def test_api_challenges_get_solve_count():
+    app = clean_db
+    chal_id = gen_challenge(app.db).id
+    # First request - unsolved
+    r = private_client.get("/api/v1/challenges")
+    assert r.status_code == 200
+    chal_data = r.get_json()["data"].pop()
+    assert chal_data["solved_by_me"] is False
+    # Solve and re-request
+    gen_solve(app.db, user_id=2, challenge_id=chal_id)
+    r = private_client.get("/api/v1/challenges")
+    assert r.status_code == 200
+    chal_data = r.get_json()["data"].pop()
+    assert chal_data["solved_by_me"] is True
+
+
+def test_api_challenges_get_solve_count(clean_db, user_factory):
     """Does the challenge list API show the solve count?"""
     # This is checked with public requests against the API after each generated
     # user makes a solve
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        chal_id = gen_challenge(app.db).id
-        with app.test_client() as client:
-            _USER_BASE = 2  # First user we create will have this ID
-            _MAX = 3  # arbitrarily selected
-            for i in range(_MAX):
-                # Confirm solve count against `i` first
-                r = client.get("/api/v1/challenges")
-                assert r.status_code == 200
-                chal_data = r.get_json()["data"].pop()
-                assert chal_data["solves"] == i
-                # Generate a new user and solve for the challenge
-                uname = "user{}".format(i)
-                uemail = uname + "@examplectf.com"
-                register_user(app, name=uname, email=uemail)
-                gen_solve(app.db, user_id=_USER_BASE + i, challenge_id=chal_id)
-            # Confirm solve count one final time against `_MAX`
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    chal_id = gen_challenge(app.db).id
+    with app.test_client() as client:
+        _MAX = 3  # arbitrarily selected
+        for i in range(_MAX):
+            # Confirm solve count against `i` first
             r = client.get("/api/v1/challenges")
             assert r.status_code == 200
             chal_data = r.get_json()["data"].pop()
-            assert chal_data["solves"] == _MAX
-    destroy_ctfd(app)
+            assert chal_data["solves"] == i
+            # Generate a new user and solve for the challenge
+            user = user_factory()
+            gen_solve(app.db, user_id=user.id, challenge_id=chal_id)
+        # Confirm solve count one final time against `_MAX`
+        r = client.get("/api/v1/challenges")
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"].pop()
+        assert chal_data["solves"] == _MAX
 
 
-def test_api_challenges_get_solve_info_score_visibility():
+def test_api_challenges_get_solve_info_score_visibility(
+    clean_db, admin_client, private_client
+):
     """Does the challenge list API show solve info if scores are hidden?"""
-    app = create_ctfd()
-    with app.app_context(), app.test_client() as pub_client:
+    app = clean_db
+    with app.test_client() as pub_client:
         set_config("challenge_visibility", "public")
 
         # Generate a challenge, user and solve to test the API with
         chal_id = gen_challenge(app.db).id
-        register_user(app)
         gen_solve(app.db, user_id=2, challenge_id=chal_id)
 
         #  With the public setting any unauthed user should see the solve
@@ -234,8 +217,7 @@ def test_api_challenges_get_solve_info_score_visibility():
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is False
         # Test authed user
-        user_client = login_as_user(app)
-        r = user_client.get("/api/v1/challenges")
+        r = private_client.get("/api/v1/challenges")
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
         assert chal_data["solves"] == 1
@@ -244,13 +226,12 @@ def test_api_challenges_get_solve_info_score_visibility():
         # With the admins setting only admins should see the solve
         set_config("score_visibility", "admins")
         # Test authed user
-        r = user_client.get("/api/v1/challenges")
+        r = private_client.get("/api/v1/challenges")
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is True
         # Test admin
-        admin_client = login_as_user(app, "admin", "password")
         r = admin_client.get("/api/v1/challenges")
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
@@ -263,18 +244,18 @@ def test_api_challenges_get_solve_info_score_visibility():
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
         assert chal_data["solves"] is None
-    destroy_ctfd(app)
 
 
-def test_api_challenges_get_solve_info_account_visibility():
+def test_api_challenges_get_solve_info_account_visibility(
+    clean_db, admin_client, private_client
+):
     """Does the challenge list API show solve info if accounts are hidden?"""
-    app = create_ctfd()
-    with app.app_context(), app.test_client() as pub_client:
+    app = clean_db
+    with app.test_client() as pub_client:
         set_config("challenge_visibility", "public")
 
         # Generate a challenge, user and solve to test the API with
         chal_id = gen_challenge(app.db).id
-        register_user(app)
         gen_solve(app.db, user_id=2, challenge_id=chal_id)
 
         #  With the public setting any unauthed user should see the solve
@@ -294,8 +275,7 @@ def test_api_challenges_get_solve_info_account_visibility():
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is False
         # Test user
-        user_client = login_as_user(app)
-        r = user_client.get("/api/v1/challenges")
+        r = private_client.get("/api/v1/challenges")
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
         assert chal_data["solves"] == 1
@@ -304,33 +284,30 @@ def test_api_challenges_get_solve_info_account_visibility():
         # With the admins setting only admins should see the solve
         set_config("account_visibility", "admins")
         # Test user
-        r = user_client.get("/api/v1/challenges")
+        r = private_client.get("/api/v1/challenges")
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is True
         # Test admin user
-        admin_client = login_as_user(app, "admin", "password")
         r = admin_client.get("/api/v1/challenges")
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
         assert chal_data["solves"] == 1
         assert chal_data["solved_by_me"] is False
-    destroy_ctfd(app)
 
 
-def test_api_challenges_get_solve_count_frozen():
+def test_api_challenges_get_solve_count_frozen(clean_db, user_factory):
     """Does the challenge list API count solves made during a freeze?"""
-    app = create_ctfd()
-    with app.app_context(), app.test_client() as client:
-        set_config("challenge_visibility", "public")
-        set_config("freeze", "1507262400")
+    app = clean_db
+    with app.test_client() as client:
+        set_configs(challenge_visibility="public", freeze="1507262400")
         chal_id = gen_challenge(app.db).id
 
         with freeze_time("2017-10-4"):
             # Create a user and generate a solve from before the freeze time
-            register_user(app, name="user1", email="user1@examplectf.com")
-            gen_solve(app.db, user_id=2, challenge_id=chal_id)
+            user = user_factory()
+            gen_solve(app.db, user_id=user.id, challenge_id=chal_id)
 
         # Confirm solve count is now `1`
         r = client.get("/api/v1/challenges")
@@ -340,209 +317,116 @@ def test_api_challenges_get_solve_count_frozen():
 
         with freeze_time("2017-10-8"):
             # Create a user and generate a solve from after the freeze time
-            register_user(app, name="user2", email="user2@examplectf.com")
-            gen_solve(app.db, user_id=3, challenge_id=chal_id)
+            user = user_factory()
+            gen_solve(app.db, user_id=user.id, challenge_id=chal_id)
 
         # Confirm solve count is still `1` despite the new solve
         r = client.get("/api/v1/challenges")
         assert r.status_code == 200
         chal_data = r.get_json()["data"].pop()
         assert chal_data["solves"] == 1
-    destroy_ctfd(app)
 
 
-def test_api_challenges_get_solve_count_hidden_user():
+def test_api_challenges_get_solve_count_hidden_user(clean_db, admin_client):
     """Does the challenge list API show solve counts for hidden users?"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        chal_id = gen_challenge(app.db).id
-        # The admin is expected to be hidden by default
-        gen_solve(app.db, user_id=1, challenge_id=chal_id)
-        with app.test_client() as client:
-            # Confirm solve count is `0` despite the hidden admin having solved
-            r = client.get("/api/v1/challenges")
-            assert r.status_code == 200
-            chal_data = r.get_json()["data"].pop()
-            assert chal_data["solves"] == 0
-        # We expect the admin to be able to see their own solve
-        with login_as_user(app, "admin") as admin:
-            r = admin.get("/api/v1/challenges")
-            assert r.status_code == 200
-            chal_data = r.get_json()["data"].pop()
-            assert chal_data["solves"] == 0
-            assert chal_data["solved_by_me"] is True
-    destroy_ctfd(app)
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    chal_id = gen_challenge(app.db).id
+    # The admin is expected to be hidden by default
+    gen_solve(app.db, user_id=1, challenge_id=chal_id)
+    with app.test_client() as client:
+        # Confirm solve count is `0` despite the hidden admin having solved
+        r = client.get("/api/v1/challenges")
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"].pop()
+        assert chal_data["solves"] == 0
+    # We expect the admin to be able to see their own solve
+    r = admin_client.get("/api/v1/challenges")
+    assert r.status_code == 200
+    chal_data = r.get_json()["data"].pop()
+    assert chal_data["solves"] == 0
+    assert chal_data["solved_by_me"] is True
 
 
-def test_api_challenges_get_solve_count_banned_user():
+def test_api_challenges_get_solve_count_banned_user(clean_db, admin_client):
     """Does the challenge list API show solve counts for banned users?"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        chal_id = gen_challenge(app.db).id
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    chal_id = gen_challenge(app.db).id
 
-        # Create a banned user and generate a solve for the challenge
-        register_user(app)
-        gen_solve(app.db, user_id=2, challenge_id=chal_id)
+    # Create a banned user and generate a solve for the challenge
+    register_user(app)
+    gen_solve(app.db, user_id=2, challenge_id=chal_id)
 
-        # Confirm that the solve is there
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges")
-            assert r.status_code == 200
-            chal_data = r.get_json()["data"].pop()
-            assert chal_data["solves"] == 1
+    # Confirm that the solve is there
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges")
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"].pop()
+        assert chal_data["solves"] == 1
 
-        # Ban the user
-        with login_as_user(app, name="admin") as client:
-            r = client.patch("/api/v1/users/2", json={"banned": True})
-        assert Users.query.get(2).banned == True
+    # Ban the user
+    r = admin_client.patch("/api/v1/users/2", json={"banned": True})
+    assert Users.query.get(2).banned == True
 
-        with app.test_client() as client:
-            # Confirm solve count is `0` despite the banned user having solved
-            r = client.get("/api/v1/challenges")
-            assert r.status_code == 200
-            chal_data = r.get_json()["data"].pop()
-            assert chal_data["solves"] == 0
-    destroy_ctfd(app)
+    with app.test_client() as client:
+        # Confirm solve count is `0` despite the banned user having solved
+        r = client.get("/api/v1/challenges")
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"].pop()
+        assert chal_data["solves"] == 0
 
 
-def test_api_challenges_post_admin():
+def test_api_challenges_post_admin(admin_client):
     """Can a user post /api/v1/challenges if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        with login_as_user(app, "admin") as client:
-            r = client.post(
-                "/api/v1/challenges",
-                json={
-                    "name": "chal",
-                    "category": "cate",
-                    "description": "desc",
-                    "value": "100",
-                    "state": "hidden",
-                    "type": "standard",
-                },
-            )
-            assert r.status_code == 200
-    destroy_ctfd(app)
-
-
-def test_api_challenge_types_post_non_admin():
+    r = admin_client.post(
+        "/api/v1/challenges",
+        json={
+            "name": "chal",
+            "category": "cate",
+            "description": "desc",
+            "value": "100",
+            "state": "hidden",
+            "type": "standard",
+        },
+    )
+    assert r.status_code == 200
+
+
+def test_api_challenge_types_post_non_admin(clean_db):
     """Can a non-admin get /api/v1/challenges/types if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/types", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges/types", content_type="application/json")
+        assert r.status_code == 403
 
 
-def test_api_challenge_types_post_admin():
+def test_api_challenge_types_post_admin(admin_client):
     """Can an admin get /api/v1/challenges/types if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        with login_as_user(app, "admin") as client:
-            r = client.get("/api/v1/challenges/types", json="")
-            assert r.status_code == 200
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_visibility_public():
-    """Can a public user get /api/v1/challenges/<challenge_id> if challenge_visibility is private/public"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        with app.test_client() as client:
-            gen_challenge(app.db)
-            r = client.get("/api/v1/challenges/1")
-            assert r.status_code == 200
-            set_config("challenge_visibility", "private")
-            r = client.get("/api/v1/challenges/1", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_ctftime_public():
-    """Can a public user get /api/v1/challenges/<challenge_id> if ctftime is over"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-7"):
-        set_config("challenge_visibility", "public")
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1")
-            assert r.status_code == 200
-            set_config(
-                "start", "1507089600"
-            )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-            set_config(
-                "end", "1507262400"
-            )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-            r = client.get("/api/v1/challenges/1")
-            assert r.status_code == 403
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_visibility_private():
-    """Can a private user get /api/v1/challenges/<challenge_id> if challenge_visibility is private/public"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges/1")
-        assert r.status_code == 200
-        set_config("challenge_visibility", "public")
-        r = client.get("/api/v1/challenges/1")
-        assert r.status_code == 200
-    destroy_ctfd(app)
+    r = admin_client.get("/api/v1/challenges/types", content_type="application/json")
+    assert r.status_code == 200
 
 
-def test_api_challenge_get_with_admin_only_account_visibility():
+def test_api_challenge_get_with_admin_only_account_visibility(clean_db, private_client):
     """Can a private user get /api/v1/challenges/<challenge_id> if account_visibility is admins_only"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges/1")
-        assert r.status_code == 200
-        set_config("account_visibility", "admins")
-        r = client.get("/api/v1/challenges/1")
-        assert r.status_code == 200
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_ctftime_private():
-    """Can a private user get /api/v1/challenges/<challenge_id> if ctftime is over"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-7"):
-        gen_challenge(app.db)
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges/1")
-        assert r.status_code == 200
-        set_config(
-            "start", "1507089600"
-        )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-        set_config(
-            "end", "1507262400"
-        )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-        r = client.get("/api/v1/challenges/1")
-        assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    r = private_client.get("/api/v1/challenges/1")
+    assert r.status_code == 200
+    set_config("account_visibility", "admins")
+    r = private_client.get("/api/v1/challenges/1")
+    assert r.status_code == 200
 
 
-def test_api_challenge_get_verified_emails():
+def test_api_challenge_get_verified_emails(clean_db, private_client):
     """Can a verified email load /api/v1/challenges/<challenge_id>"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-5"):
-        set_config(
-            "start", "1507089600"
-        )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-        set_config(
-            "end", "1507262400"
-        )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-        set_config("verify_emails", True)
+    app = clean_db
+    with freeze_time("2017-10-5"):
+        set_configs(
+            start="1507089600",  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
+            end="1507262400",  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
+            verify_emails=True,
+        )
         gen_challenge(app.db)
         gen_user(
             app.db,
@@ -551,64 +435,52 @@ def test_api_challenge_get_verified_emails():
             password="password",
             verified=True,
         )
-        register_user(app)
-        client = login_as_user(app)
         registered_client = login_as_user(app, "user_name", "password")
-        r = client.get("/api/v1/challenges/1", json="")
+        r = private_client.get("/api/v1/challenges/1", content_type="application/json")
         assert r.status_code == 403
         r = registered_client.get("/api/v1/challenges/1")
         assert r.status_code == 200
-    destroy_ctfd(app)
 
 
-def test_api_challenge_get_non_existing():
+def test_api_challenge_get_non_existing(private_client):
     """Will a bad <challenge_id> at /api/v1/challenges/<challenge_id> 404"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-5"):
-        set_config(
-            "start", "1507089600"
-        )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-        set_config(
-            "end", "1507262400"
-        )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges/1")
+    with freeze_time("2017-10-5"):
+        set_configs(
+            start="1507089600",  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
+            end="1507262400",  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
+        )
+        r = private_client.get("/api/v1/challenges/1")
         assert r.status_code == 404
-    destroy_ctfd(app)
 
 
-def test_api_challenge_get_solve_status():
+def test_api_challenge_get_solve_status(clean_db, private_client):
     """Does the challenge detail API show the current user's solve status?"""
-    app = create_ctfd()
-    with app.app_context():
-        chal_id = gen_challenge(app.db).id
-        chal_uri = "/api/v1/challenges/{}".format(chal_id)
-        register_user(app)
-        client = login_as_user(app)
-        # First request - unsolved
-        r = client.get(chal_uri)
-        assert r.status_code == 200
-        chal_data = r.get_json()["data"]
-        assert chal_data["solved_by_me"] is False
-        # Solve and re-request
-        gen_solve(app.db, user_id=2, challenge_id=chal_id)
-        r = client.get(chal_uri)
-        assert r.status_code == 200
-        chal_data = r.get_json()["data"]
-        assert chal_data["solved_by_me"] is True
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_solve_info_score_visibility():
+    app = clean_db
+    chal_id = gen_challenge(app.db).id
+    chal_uri = "/api/v1/challenges/{}".format(chal_id)
+    # First request - unsolved
+    r = private_client.get(chal_uri)
+    assert r.status_code == 200
+    chal_data = r.get_json()["data"]
+    assert chal_data["solved_by_me"] is False
+    # Solve and re-request
+    gen_solve(app.db, user_id=2, challenge_id=chal_id)
+    r = private_client.get(chal_uri)
+    assert r.status_code == 200
+    chal_data = r.get_json()["data"]
+    assert chal_data["solved_by_me"] is True
+
+
+def test_api_challenge_get_solve_info_score_visibility(
+    clean_db, admin_client, private_client
+):
     """Does the challenge detail API show solve info if scores are hidden?"""
-    app = create_ctfd()
-    with app.app_context(), app.test_client() as pub_client:
+    app = clean_db
+    with app.test_client() as pub_client:
         set_config("challenge_visibility", "public")
         # Generate a challenge, user and solve to test the API with
         chal_id = gen_challenge(app.db).id
         chal_uri = "/api/v1/challenges/{}".format(chal_id)
-        register_user(app)
         gen_solve(app.db, user_id=2, challenge_id=chal_id)
 
         #  With the public setting any unauthed user should see the solve
@@ -628,8 +500,7 @@ def test_api_challenge_get_solve_info_score_visibility():
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is False
         # Test user
-        user_client = login_as_user(app)
-        r = user_client.get(chal_uri)
+        r = private_client.get(chal_uri)
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
         assert chal_data["solves"] == 1
@@ -638,13 +509,12 @@ def test_api_challenge_get_solve_info_score_visibility():
         # With the admins setting only admins should see the solve
         set_config("score_visibility", "admins")
         # Test user
-        r = user_client.get(chal_uri)
+        r = private_client.get(chal_uri)
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is True
         # Test admin user
-        admin_client = login_as_user(app, "admin", "password")
         r = admin_client.get(chal_uri)
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
@@ -657,18 +527,18 @@ def test_api_challenge_get_solve_info_score_visibility():
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
         assert chal_data["solves"] is None
-    destroy_ctfd(app)
 
 
-def test_api_challenge_get_solve_info_account_visibility():
+def test_api_challenge_get_solve_info_account_visibility(
+    clean_db, admin_client, private_client
+):
     """Does the challenge detail API show solve info if accounts are hidden?"""
-    app = create_ctfd()
-    with app.app_context(), app.test_client() as pub_client:
+    app = clean_db
+    with app.test_client() as pub_client:
         set_config("challenge_visibility", "public")
         # Generate a challenge, user and solve to test the API with
         chal_id = gen_challenge(app.db).id
         chal_uri = "/api/v1/challenges/{}".format(chal_id)
-        register_user(app)
         gen_solve(app.db, user_id=2, challenge_id=chal_id)
 
         #  With the public setting any unauthed user should see the solve
@@ -688,8 +558,7 @@ def test_api_challenge_get_solve_info_account_visibility():
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is False
         # Test user
-        user_client = login_as_user(app)
-        r = user_client.get(chal_uri)
+        r = private_client.get(chal_uri)
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
         assert chal_data["solves"] == 1
@@ -698,13 +567,12 @@ def test_api_challenge_get_solve_info_account_visibility():
         # With the admins setting only admins should see the solve
         set_config("account_visibility", "admins")
         # Test user
-        r = user_client.get(chal_uri)
+        r = private_client.get(chal_uri)
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
         assert chal_data["solves"] is None
         assert chal_data["solved_by_me"] is True
         # Test admin user
-        admin_client = login_as_user(app, "admin", "password")
         r = admin_client.get(chal_uri)
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
@@ -718,54 +586,49 @@ def test_api_challenge_get_solve_info_account_visibility():
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
         assert chal_data["solves"] == 1
-    destroy_ctfd(app)
 
 
-def test_api_challenge_get_solve_count():
+def test_api_challenge_get_solve_count(clean_db, user_factory):
     """Does the challenge detail API show the solve count?"""
     # This is checked with public requests against the API after each generated
     # user makes a solve
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        chal_id = gen_challenge(app.db).id
-        chal_uri = "/api/v1/challenges/{}".format(chal_id)
-        with app.test_client() as client:
-            _USER_BASE = 2  # First user we create will have this ID
-            _MAX = 3  # arbitrarily selected
-            for i in range(_MAX):
-                # Confirm solve count against `i` first
-                r = client.get(chal_uri)
-                assert r.status_code == 200
-                chal_data = r.get_json()["data"]
-                assert chal_data["solves"] == i
-                # Generate a new user and solve for the challenge
-                uname = "user{}".format(i)
-                uemail = uname + "@examplectf.com"
-                register_user(app, name=uname, email=uemail)
-                gen_solve(app.db, user_id=_USER_BASE + i, challenge_id=chal_id)
-            # Confirm solve count one final time against `_MAX`
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    chal_id = gen_challenge(app.db).id
+    chal_uri = "/api/v1/challenges/{}".format(chal_id)
+    with app.test_client() as client:
+        _MAX = 3  # arbitrarily selected
+        for i in range(_MAX):
+            # Confirm solve count against `i` first
             r = client.get(chal_uri)
             assert r.status_code == 200
             chal_data = r.get_json()["data"]
-            assert chal_data["solves"] == _MAX
-    destroy_ctfd(app)
+            assert chal_data["solves"] == i
+            # Generate a new user and solve for the challenge
+            user = user_factory()
+            gen_solve(app.db, user_id=user.id, challenge_id=chal_id)
+        # Confirm solve count one final time against `_MAX`
+        r = client.get(chal_uri)
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"]
+        assert chal_data["solves"] == _MAX
 
 
-def test_api_challenge_get_solve_count_frozen():
+def test_api_challenge_get_solve_count_frozen(clean_db, user_factory):
     """Does the challenge detail API count solves made during a freeze?"""
-    app = create_ctfd()
-    with app.app_context(), app.test_client() as client:
-        set_config("challenge_visibility", "public")
-        # Friday, October 6, 2017 4:00:00 AM
-        set_config("freeze", "1507262400")
+    app = clean_db
+    with app.test_client() as client:
+        set_configs(
+            challenge_visibility="public",
+            freeze="1507262400",  # Friday, October 6, 2017 4:00:00 AM
+        )
         chal_id = gen_challenge(app.db).id
         chal_uri = "/api/v1/challenges/{}".format(chal_id)
 
         with freeze_time("2017-10-4"):
             # Create a user and generate a solve from before the freeze time
-            register_user(app, name="user1", email="user1@examplectf.com")
-            gen_solve(app.db, user_id=2, challenge_id=chal_id)
+            user = user_factory()
+            gen_solve(app.db, user_id=user.id, challenge_id=chal_id)
 
         # Confirm solve count is now `1`
         r = client.get(chal_uri)
@@ -775,151 +638,126 @@ def test_api_challenge_get_solve_count_frozen():
 
         with freeze_time("2017-10-8"):
             # Create a user and generate a solve from after the freeze time
-            register_user(app, name="user2", email="user2@examplectf.com")
-            gen_solve(app.db, user_id=3, challenge_id=chal_id)
+            user = user_factory()
+            gen_solve(app.db, user_id=user.id, challenge_id=chal_id)
 
         # Confirm solve count is still `1` despite the new solve
         r = client.get(chal_uri)
         assert r.status_code == 200
         chal_data = r.get_json()["data"]
         assert chal_data["solves"] == 1
-    destroy_ctfd(app)
 
 
-def test_api_challenge_get_solve_count_hidden_user():
+def test_api_challenge_get_solve_count_hidden_user(clean_db):
     """Does the challenge detail API show solve counts for hidden users?"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        chal_id = gen_challenge(app.db).id
-        chal_uri = "/api/v1/challenges/{}".format(chal_id)
-        # The admin is expected to be hidden by default
-        gen_solve(app.db, user_id=1, challenge_id=chal_id)
-        with app.test_client() as client:
-            # Confirm solve count is `0` despite the hidden admin having solved
-            r = client.get(chal_uri)
-            assert r.status_code == 200
-            chal_data = r.get_json()["data"]
-            assert chal_data["solves"] == 0
-    destroy_ctfd(app)
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    chal_id = gen_challenge(app.db).id
+    chal_uri = "/api/v1/challenges/{}".format(chal_id)
+    # The admin is expected to be hidden by default
+    gen_solve(app.db, user_id=1, challenge_id=chal_id)
+    with app.test_client() as client:
+        # Confirm solve count is `0` despite the hidden admin having solved
+        r = client.get(chal_uri)
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"]
+        assert chal_data["solves"] == 0
 
 
-def test_api_challenge_get_solve_count_banned_user():
+def test_api_challenge_get_solve_count_banned_user(clean_db, admin_client):
     """Does the challenge detail API show solve counts for banned users?"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        chal_id = gen_challenge(app.db).id
-        chal_uri = "/api/v1/challenges/{}".format(chal_id)
+    app = clean_db
+    set_config("challenge_visibility", "public")
+    chal_id = gen_challenge(app.db).id
+    chal_uri = "/api/v1/challenges/{}".format(chal_id)
 
-        # Create a user and generate a solve for the challenge
-        register_user(app)
-        gen_solve(app.db, user_id=2, challenge_id=chal_id)
+    # Create a user and generate a solve for the challenge
+    register_user(app)
+    gen_solve(app.db, user_id=2, challenge_id=chal_id)
 
-        # Confirm that the solve is there
-        with app.test_client() as client:
-            r = client.get(chal_uri)
-            assert r.status_code == 200
-            chal_data = r.get_json()["data"]
-            assert chal_data["solves"] == 1
+    # Confirm that the solve is there
+    with app.test_client() as client:
+        r = client.get(chal_uri)
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"]
+        assert chal_data["solves"] == 1
 
-        # Ban the user
-        with login_as_user(app, name="admin") as client:
-            r = client.patch("/api/v1/users/2", json={"banned": True})
-        assert Users.query.get(2).banned == True
+    # Ban the user
+    r = admin_client.patch("/api/v1/users/2", json={"banned": True})
+    assert Users.query.get(2).banned == True
 
-        # Confirm solve count is `0` despite the banned user having solved
-        with app.test_client() as client:
-            r = client.get(chal_uri)
-            assert r.status_code == 200
-            chal_data = r.get_json()["data"]
-            assert chal_data["solves"] == 0
-    destroy_ctfd(app)
+    # Confirm solve count is `0` despite the banned user having solved
+    with app.test_client() as client:
+        r = client.get(chal_uri)
+        assert r.status_code == 200
+        chal_data = r.get_json()["data"]
+        assert chal_data["solves"] == 0
 
 
-def test_api_challenge_patch_non_admin():
+def test_api_challenge_patch_non_admin(clean_db):
     """Can a user patch /api/v1/challenges/<challenge_id> if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.patch("/api/v1/challenges/1", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.patch("/api/v1/challenges/1", json="")
+        assert r.status_code == 403
 
 
-def test_api_challenge_patch_admin():
+def test_api_challenge_patch_admin(clean_db, admin_client):
     """Can a user patch /api/v1/challenges/<challenge_id> if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with login_as_user(app, "admin") as client:
-            r = client.patch(
-                "/api/v1/challenges/1", json={"name": "chal_name", "value": "200"}
-            )
-            assert r.status_code == 200
-            assert r.get_json()["data"]["value"] == 200
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    r = admin_client.patch(
+        "/api/v1/challenges/1", json={"name": "chal_name", "value": "200"}
+    )
+    assert r.status_code == 200
+    assert r.get_json()["data"]["value"] == 200
 
 
-def test_api_challenge_delete_non_admin():
+def test_api_challenge_delete_non_admin(clean_db):
     """Can a user delete /api/v1/challenges/<challenge_id> if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.delete("/api/v1/challenges/1", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.delete("/api/v1/challenges/1", json="")
+        assert r.status_code == 403
 
 
-def test_api_challenge_delete_admin():
+def test_api_challenge_delete_admin(clean_db, admin_client):
     """Can a user delete /api/v1/challenges/<challenge_id> if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with login_as_user(app, "admin") as client:
-            r = client.delete("/api/v1/challenges/1", json="")
-            assert r.status_code == 200
-            assert r.get_json().get("data") is None
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    r = admin_client.delete("/api/v1/challenges/1", json="")
+    assert r.status_code == 200
+    assert r.get_json().get("data") is None
 
 
-def test_api_challenge_with_properties_delete_admin():
+def test_api_challenge_with_properties_delete_admin(clean_db, admin_client):
     """Can a user delete /api/v1/challenges/<challenge_id> if the challenge has other properties"""
-    app = create_ctfd()
-    with app.app_context():
-        challenge = gen_challenge(app.db)
-        gen_hint(app.db, challenge_id=challenge.id)
-        gen_tag(app.db, challenge_id=challenge.id)
-        gen_flag(app.db, challenge_id=challenge.id)
-
-        challenge = Challenges.query.filter_by(id=1).first()
-        assert len(challenge.hints) == 1
-        assert len(challenge.tags) == 1
-        assert len(challenge.flags) == 1
-
-        with login_as_user(app, "admin") as client:
-            r = client.delete("/api/v1/challenges/1", json="")
-            assert r.status_code == 200
-            assert r.get_json().get("data") is None
+    app = clean_db
+    gen_challenge_with_properties(app.db)
 
-        assert Tags.query.count() == 0
-        assert Hints.query.count() == 0
-        assert Flags.query.count() == 0
+    challenge = Challenges.query.filter_by(id=1).first()
+    assert len(challenge.hints) == 1
+    assert len(challenge.tags) == 1
+    assert len(challenge.flags) == 1
 
-    destroy_ctfd(app)
+    r = admin_client.delete("/api/v1/challenges/1", json="")
+    assert r.status_code == 200
+    assert r.get_json().get("data") is None
 
+    assert Tags.query.count() == 0
+    assert Hints.query.count() == 0
+    assert Flags.query.count() == 0
 
-def test_api_challenge_attempt_post_public():
+
+def test_api_challenge_attempt_post_public(clean_db):
     """Can a public user post /api/v1/challenges/attempt"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.post("/api/v1/challenges/attempt", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.post("/api/v1/challenges/attempt", json="")
+        assert r.status_code == 403
 
 
 def test_api_challenge_attempt_post_private():
@@ -1003,218 +841,127 @@ def test_api_challenge_attempt_post_private():
     destroy_ctfd(app)
 
 
-def test_api_challenge_attempt_post_admin():
+def test_api_challenge_attempt_post_admin(clean_db, admin_client):
     """Can an admin user post /api/v1/challenges/attempt"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        gen_flag(app.db, 1)
-        with login_as_user(app, "admin") as client:
-            r = client.post(
-                "/api/v1/challenges/attempt",
-                json={"challenge_id": 1, "submission": "wrong_flag"},
-            )
-            assert r.status_code == 200
-            assert r.get_json()["data"]["status"] == "incorrect"
-            r = client.post(
-                "/api/v1/challenges/attempt",
-                json={"challenge_id": 1, "submission": "flag"},
-            )
-            assert r.status_code == 200
-            assert r.get_json()["data"]["status"] == "correct"
-            r = client.post(
-                "/api/v1/challenges/attempt",
-                json={"challenge_id": 1, "submission": "flag"},
-            )
-            assert r.status_code == 200
-            assert r.get_json()["data"]["status"] == "already_solved"
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_solves_visibility_public():
-    """Can a public user get /api/v1/challenges/<challenge_id>/solves if challenge_visibility is private/public"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            set_config("challenge_visibility", "public")
-            r = client.get("/api/v1/challenges/1/solves", json="")
-            assert r.status_code == 200
-            set_config("challenge_visibility", "private")
-            r = client.get("/api/v1/challenges/1/solves", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_solves_ctftime_public():
-    """Can a public user get /api/v1/challenges/<challenge_id>/solves if ctftime is over"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-7"):
-        set_config("challenge_visibility", "public")
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1/solves")
-            assert r.status_code == 200
-            set_config(
-                "start", "1507089600"
-            )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-            set_config(
-                "end", "1507262400"
-            )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-            r = client.get("/api/v1/challenges/1/solves", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_solves_ctf_frozen():
+    app = clean_db
+    gen_challenge(app.db)
+    gen_flag(app.db, 1)
+    r = admin_client.post(
+        "/api/v1/challenges/attempt",
+        json={"challenge_id": 1, "submission": "wrong_flag"},
+    )
+    assert r.status_code == 200
+    assert r.get_json()["data"]["status"] == "incorrect"
+    r = admin_client.post(
+        "/api/v1/challenges/attempt",
+        json={"challenge_id": 1, "submission": "flag"},
+    )
+    assert r.status_code == 200
+    assert r.get_json()["data"]["status"] == "correct"
+    r = admin_client.post(
+        "/api/v1/challenges/attempt",
+        json={"challenge_id": 1, "submission": "flag"},
+    )
+    assert r.status_code == 200
+    assert r.get_json()["data"]["status"] == "already_solved"
+
+
+def test_api_challenge_get_solves_ctf_frozen(clean_db, admin_client):
     """Test users can only see challenge solves that happened before freeze time"""
-    app = create_ctfd()
-    with app.app_context():
-        register_user(app, name="user1", email="user1@examplectf.com")
-        register_user(app, name="user2", email="user2@examplectf.com")
-
-        # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-        set_config("freeze", "1507262400")
-        with freeze_time("2017-10-4"):
-            chal = gen_challenge(app.db)
-            chal_id = chal.id
-            gen_solve(app.db, user_id=2, challenge_id=chal_id)
-            chal2 = gen_challenge(app.db)
-            chal2_id = chal2.id
-
-        with freeze_time("2017-10-8"):
-            # User ID 2 solves Challenge ID 2
-            gen_solve(app.db, user_id=2, challenge_id=chal2_id)
-            # User ID 3 solves Challenge ID 1
-            gen_solve(app.db, user_id=3, challenge_id=chal_id)
+    app = clean_db
+    # user0 is User ID 2 and user1 is User ID 3
+    gen_users(app.db, 2)
 
-            # Challenge 1 has 2 solves
-            # Challenge 2 has 1 solve
-
-            # There should now be two solves assigned to the same user.
-            assert Solves.query.count() == 3
-
-            client = login_as_user(app, name="user2")
-
-            # Challenge 1 should have one solve (after freeze)
-            r = client.get("/api/v1/challenges/1")
-            data = r.get_json()["data"]
-            assert data["solves"] == 1
-
-            # Challenge 1 should have one solve (after freeze)
-            r = client.get("/api/v1/challenges/1/solves")
-            data = r.get_json()["data"]
-            assert len(data) == 1
+    # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
+    set_config("freeze", "1507262400")
+    with freeze_time("2017-10-4"):
+        chal = gen_challenge(app.db)
+        chal_id = chal.id
+        gen_solve(app.db, user_id=2, challenge_id=chal_id)
+        chal2 = gen_challenge(app.db)
+        chal2_id = chal2.id
 
-            # Challenge 2 should have a solve shouldn't be shown to the user
-            r = client.get("/api/v1/challenges/2/solves")
-            data = r.get_json()["data"]
-            assert len(data) == 0
+    with freeze_time("2017-10-8"):
+        # User ID 2 solves Challenge ID 2 and User ID 3 solves Challenge ID 1
+        gen_solves(app.db, [(2, chal2_id), (3, chal_id)])
 
-            # Admins should see data as an admin with no modifications
-            admin = login_as_user(app, name="admin")
-            r = admin.get("/api/v1/challenges/2/solves")
-            data = r.get_json()["data"]
-            assert len(data) == 1
+        # Challenge 1 has 2 solves
+        # Challenge 2 has 1 solve
 
-            # But should see as a user if the preview param is passed
-            r = admin.get("/api/v1/challenges/2/solves?preview=true")
-            data = r.get_json()["data"]
-            assert len(data) == 0
+        # There should now be two solves assigned to the same user.
+        assert Solves.query.count() == 3
 
-    destroy_ctfd(app)
+        client = login_as_user(app, name="user1")
 
+        # Challenge 1 should have one solve (after freeze)
+        r = client.get("/api/v1/challenges/1")
+        data = r.get_json()["data"]
+        assert data["solves"] == 1
 
-def test_api_challenge_get_solves_visibility_private():
-    """Can a private user get /api/v1/challenges/<challenge_id>/solves if challenge_visibility is private/public"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges/1/solves")
-        assert r.status_code == 200
-        set_config("challenge_visibility", "public")
+        # Challenge 1 should have one solve (after freeze)
         r = client.get("/api/v1/challenges/1/solves")
-        assert r.status_code == 200
-    destroy_ctfd(app)
+        data = r.get_json()["data"]
+        assert len(data) == 1
 
+        # Challenge 2 should have a solve shouldn't be shown to the user
+        r = client.get("/api/v1/challenges/2/solves")
+        data = r.get_json()["data"]
+        assert len(data) == 0
 
-def test_api_challenge_get_solves_ctftime_private():
-    """Can a private user get /api/v1/challenges/<challenge_id>/solves if ctftime is over"""
-    app = create_ctfd()
-    with app.app_context(), freeze_time("2017-10-7"):
-        gen_challenge(app.db)
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges/1/solves")
-        assert r.status_code == 200
-        set_config(
-            "start", "1507089600"
-        )  # Wednesday, October 4, 2017 12:00:00 AM GMT-04:00 DST
-        set_config(
-            "end", "1507262400"
-        )  # Friday, October 6, 2017 12:00:00 AM GMT-04:00 DST
-        r = client.get("/api/v1/challenges/1/solves")
-        assert r.status_code == 403
-    destroy_ctfd(app)
+        # Admins should see data as an admin with no modifications
+        r = admin_client.get("/api/v1/challenges/2/solves")
+        data = r.get_json()["data"]
+        assert len(data) == 1
 
-
-def test_api_challenge_get_solves_verified_emails():
-    """Can a verified email get /api/v1/challenges/<challenge_id>/solves"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("verify_emails", True)
-        gen_challenge(app.db)
-        gen_user(
-            app.db,
-            name="user_name",
-            email="verified_user@examplectf.com",
-            password="password",
-            verified=True,
-        )
-        register_user(app)
-        client = login_as_user(app)
-        registered_client = login_as_user(app, "user_name", "password")
-        r = client.get("/api/v1/challenges/1/solves", json="")
-        assert r.status_code == 403
-        r = registered_client.get("/api/v1/challenges/1/solves")
-        assert r.status_code == 200
-    destroy_ctfd(app)
+        # But should see as a user if the preview param is passed
+        r = admin_client.get("/api/v1/challenges/2/solves?preview=true")
+        data = r.get_json()["data"]
+        assert len(data) == 0
 
 
-def test_api_challenges_get_solves_score_visibility():
+def test_api_challenge_get_solves_verified_emails(clean_db, private_client):
+    """Can a verified email get /api/v1/challenges/<challenge_id>/solves"""
+    app = clean_db
+    set_config("verify_emails", True)
+    gen_challenge(app.db)
+    gen_user(
+        app.db,
+        name="user_name",
+        email="verified_user@examplectf.com",
+        password="password",
+        verified=True,
+    )
+    registered_client = login_as_user(app, "user_name", "password")
+    r = private_client.get(
+        "/api/v1/challenges/1/solves", content_type="application/json"
+    )
+    assert r.status_code == 403
+    r = registered_client.get("/api/v1/challenges/1/solves")
+    assert r.status_code == 200
+
+
+def test_api_challenges_get_solves_score_visibility(
+    clean_db, admin_client, private_client
+):
     """Can a user get /api/v1/challenges/<challenge_id>/solves if score_visibility is public/private/admin"""
-    app = create_ctfd()
-    with app.app_context():
-        set_config("challenge_visibility", "public")
-        set_config("score_visibility", "public")
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1/solves")
-            assert r.status_code == 200
-        set_config("challenge_visibility", "private")
-        set_config("score_visibility", "private")
-        register_user(app)
-        private_client = login_as_user(app)
-        r = private_client.get("/api/v1/challenges/1/solves")
-        assert r.status_code == 200
-        set_config("score_visibility", "admins")
-        admin = login_as_user(app, "admin", "password")
-        r = admin.get("/api/v1/challenges/1/solves")
+    app = clean_db
+    set_configs(challenge_visibility="public", score_visibility="public")
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges/1/solves")
         assert r.status_code == 200
-    destroy_ctfd(app)
+    set_configs(challenge_visibility="private", score_visibility="private")
+    r = private_client.get("/api/v1/challenges/1/solves")
+    assert r.status_code == 200
+    set_config("score_visibility", "admins")
+    r = admin_client.get("/api/v1/challenges/1/solves")
+    assert r.status_code == 200
 
 
-def test_api_challenge_get_solves_404():
+def test_api_challenge_get_solves_404(private_client):
     """Will a bad <challenge_id> at /api/v1/challenges/<challenge_id>/solves 404"""
-    app = create_ctfd()
-    with app.app_context():
-        register_user(app)
-        client = login_as_user(app)
-        r = client.get("/api/v1/challenges/1/solves")
-        assert r.status_code == 404
-    destroy_ctfd(app)
+    r = private_client.get("/api/v1/challenges/1/solves")
+    assert r.status_code == 404
 
 
 def test_api_challenge_solves_returns_correct_data():
@@ -1272,117 +1019,92 @@ def test_api_challenge_solves_returns_correct_data():
     destroy_ctfd(app)
 
 
-def test_api_challenge_get_files_non_admin():
+def test_api_challenge_get_files_non_admin(clean_db):
     """Can a user get /api/v1/challenges/<challenge_id>/files if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1/files", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges/1/files", content_type="application/json")
+        assert r.status_code == 403
 
 
-def test_api_challenge_get_files_admin():
+def test_api_challenge_get_files_admin(clean_db, admin_client):
     """Can a user get /api/v1/challenges/<challenge_id>/files if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with login_as_user(app, "admin") as client:
-            r = client.get("/api/v1/challenges/1/files")
-            assert r.status_code == 200
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    r = admin_client.get("/api/v1/challenges/1/files")
+    assert r.status_code == 200
 
 
-def test_api_challenge_get_tags_non_admin():
+def test_api_challenge_get_tags_non_admin(clean_db):
     """Can a user get /api/v1/challenges/<challenge_id>/tags if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1/tags", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges/1/tags", content_type="application/json")
+        assert r.status_code == 403
 
 
-def test_api_challenge_get_tags_admin():
+def test_api_challenge_get_tags_admin(clean_db, admin_client):
     """Can a user get /api/v1/challenges/<challenge_id>/tags if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with login_as_user(app, "admin") as client:
-            r = client.get("/api/v1/challenges/1/tags")
-            assert r.status_code == 200
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    r = admin_client.get("/api/v1/challenges/1/tags")
+    assert r.status_code == 200
 
 
-def test_api_challenge_get_topics_non_admin():
+def test_api_challenge_get_topics_non_admin(clean_db):
     """Can a user get /api/v1/challenges/<challenge_id>/topics if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        gen_topic(app.db, challenge_id=1)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1/topics", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    gen_topic(app.db, challenge_id=1)
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges/1/topics", content_type="application/json")
+        assert r.status_code == 403
 
 
-def test_api_challenge_get_topics_admin():
+def test_api_challenge_get_topics_admin(clean_db, admin_client):
     """Can a user get /api/v1/challenges/<challenge_id>/topics if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        gen_topic(app.db, challenge_id=1)
-        with login_as_user(app, name="admin") as client:
-            r = client.get("/api/v1/challenges/1/topics", json="")
-            assert r.status_code == 200
-            assert r.get_json() == {
-                "success": True,
-                "data": [{"id": 1, "challenge_id": 1, "topic_id": 1, "value": "topic"}],
-            }
-    destroy_ctfd(app)
-
-
-def test_api_challenge_get_hints_non_admin():
+    app = clean_db
+    gen_challenge(app.db)
+    gen_topic(app.db, challenge_id=1)
+    r = admin_client.get("/api/v1/challenges/1/topics", content_type="application/json")
+    assert r.status_code == 200
+    assert r.get_json() == {
+        "success": True,
+        "data": [{"id": 1, "challenge_id": 1, "topic_id": 1, "value": "topic"}],
+    }
+
+
+def test_api_challenge_get_hints_non_admin(clean_db):
     """Can a user get /api/v1/challenges/<challenge_id>/hints if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1/hints", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges/1/hints", content_type="application/json")
+        assert r.status_code == 403
 
 
-def test_api_challenge_get_hints_admin():
+def test_api_challenge_get_hints_admin(clean_db, admin_client):
     """Can a user get /api/v1/challenges/<challenge_id>/hints if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with login_as_user(app, "admin") as client:
-            r = client.get("/api/v1/challenges/1/hints")
-            assert r.status_code == 200
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    r = admin_client.get("/api/v1/challenges/1/hints")
+    assert r.status_code == 200
 
 
-def test_api_challenge_get_flags_non_admin():
+def test_api_challenge_get_flags_non_admin(clean_db):
     """Can a user get /api/v1/challenges/<challenge_id>/flags if not admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with app.test_client() as client:
-            r = client.get("/api/v1/challenges/1/flags", json="")
-            assert r.status_code == 403
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    with app.test_client() as client:
+        r = client.get("/api/v1/challenges/1/flags", content_type="application/json")
+        assert r.status_code == 403
 
 
-def test_api_challenge_get_flags_admin():
+def test_api_challenge_get_flags_admin(clean_db, admin_client):
     """Can a user get /api/v1/challenges/<challenge_id>/flags if admin"""
-    app = create_ctfd()
-    with app.app_context():
-        gen_challenge(app.db)
-        with login_as_user(app, "admin") as client:
-            r = client.get("/api/v1/challenges/1/flags")
-            assert r.status_code == 200
-    destroy_ctfd(app)
+    app = clean_db
+    gen_challenge(app.db)
+    r = admin_client.get("/api/v1/challenges/1/flags")
+    assert r.status_code == 200
@@ -790,7 +790,6 @@ def test_api_team_captain_disbanding_only_inactive_teams():
         app.db.session.commit()
         with login_as_user(app, name="user3") as client:
             r = client.delete("/api/v1/teams/me", json="")
-            print(r.get_json())
             assert r.status_code == 200
             assert r.get_json() == {"success": True}
     destroy_ctfd(app)
@@ -0,0 +1,219 @@
+import itertools
+import os
+import sqlite3
+
+import pytest
+from passlib.hash import plaintext
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import CTFd.utils.crypto
+from CTFd.cache import cache
+from CTFd.models import Admins
+from CTFd.utils import set_config
+from CTFd.utils.security.csrf import generate_nonce
+from CTFd.utils.security.signing import hmac
+from tests.helpers import create_ctfd, destroy_ctfd, gen_user
+
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_test_pragmas(dbapi_connection, connection_record):
+    """
+    Test databases don't need to survive a crash so skip journaling to disk and fsyncs.
+    This only matters when TESTING_DATABASE_URL points at an SQLite file.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def enable_sqlite_savepoints(engine):
+    """
+    pysqlite defers BEGIN until the first DML statement which breaks SAVEPOINT
+    handling. Hand transaction control to SQLAlchemy so nested transactions work.
+    https://docs.sqlalchemy.org/en/14/dialects/sqlite.html#serializable-isolation-savepoints-transactional-ddl
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    # The in-memory test database uses a StaticPool so the connection already exists
+    with engine.connect() as connection:
+        connection.connection.isolation_level = None
+
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+def reset_identities(connection, metadata):
+    """
+    Rolling back doesn't give back ids handed out by Postgres sequences or MySQL
+    auto increment counters. Rewind them so tests can keep expecting the ids a
+    freshly set up CTFd would assign. SQLite reuses rolled back rowids on its own.
+    """
+    dialect = connection.dialect.name
+    for table in metadata.sorted_tables:
+        if "id" not in table.c or not table.c.id.autoincrement:
+            continue
+        if dialect == "postgresql":
+            connection.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE(MAX(id), 0) + 1, false) FROM {table.name}"
+            )
+        elif dialect == "mysql":
+            connection.exec_driver_sql(f"ALTER TABLE {table.name} AUTO_INCREMENT = 1")
+
+
+# The hasher CTFd actually uses, kept for the tests that check hashing itself
+BCRYPT_SHA256 = CTFd.utils.crypto.bcrypt_sha256
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_password_hashing():
+    """
+    Hash passwords with the minimum bcrypt cost. Every registration, login and
+    gen_user/gen_team otherwise pays for the default 2^12 rounds.
+    Setting CTFD_TEST_FAST_HASH skips hashing entirely for quick local runs.
+    Tests of the hashing itself should use the real_password_hashing fixture.
+    """
+    if os.getenv("CTFD_TEST_FAST_HASH"):
+        CTFd.utils.crypto.bcrypt_sha256 = plaintext
+    else:
+        CTFd.utils.crypto.bcrypt_sha256 = BCRYPT_SHA256.using(rounds=4)
+    yield
+    CTFd.utils.crypto.bcrypt_sha256 = BCRYPT_SHA256
+
+
+@pytest.fixture
+def real_password_hashing(monkeypatch):
+    """
+    Puts CTFd's own bcrypt_sha256 hasher back for the duration of the test
+    """
+    monkeypatch.setattr(CTFd.utils.crypto, "bcrypt_sha256", BCRYPT_SHA256)
+
+
+@pytest.fixture(scope="session")
+def _ctfd_app():
+    """
+    A single set up CTFd instance shared by every test in the session
+    """
+    app = create_ctfd()
+    with app.app_context():
+        enable_sqlite_savepoints(app.db.engine)
+    yield app
+    destroy_ctfd(app)
+
+
+@pytest.fixture
+def clean_db(_ctfd_app):
+    """
+    Runs a test against the shared CTFd instance inside a transaction which is
+    rolled back afterwards. Commits made by the test or by CTFd itself only
+    release a SAVEPOINT so the database is left exactly as setup_ctfd made it.
+    """
+    app = _ctfd_app
+    db = app.db
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        nested = connection.begin_nested()
+
+        @event.listens_for(db.session, "after_transaction_end")
+        def restart_savepoint(session, trans):
+            nonlocal nested
+            if not nested.is_active:
+                nested = connection.begin_nested()
+
+        # Flask-SQLAlchemy binds every table to the engine so those need clearing too
+        db.session.remove()
+        session_kw = dict(db.session.session_factory.kw)
+        db.session.configure(bind=connection, binds={})
+        try:
+            yield app
+        finally:
+            db.session.remove()
+            db.session.session_factory.kw = session_kw
+            event.remove(db.session, "after_transaction_end", restart_savepoint)
+            transaction.rollback()
+            reset_identities(connection, db.metadata)
+            connection.close()
+            cache.clear()
+
+
+@pytest.fixture
+def clean_db_team_mode(clean_db):
+    """
+    clean_db with the shared CTFd instance switched to teams mode for the test
+    """
+    set_config("user_mode", "teams")
+    return clean_db
+
+
+@pytest.fixture(scope="session")
+def _admin_session(_ctfd_app):
+    """
+    The session contents login_user() would give the admin created by setup_ctfd.
+    Built once so tests don't pay for a /login round-trip and bcrypt verification.
+    """
+    with _ctfd_app.app_context():
+        admin = Admins.query.filter_by(name="admin").first()
+        return {"id": admin.id, "nonce": generate_nonce(), "hash": hmac(admin.password)}
+
+
+@pytest.fixture
+def admin_client(clean_db, _admin_session):
+    """
+    A test client already logged in as the admin
+    """
+    client = clean_db.test_client()
+    with client.session_transaction() as sess:
+        sess.update(_admin_session)
+    return client
+
+
+@pytest.fixture
+def private_client(clean_db):
+    """
+    A test client logged in as a regular user. The user is what register_user()
+    would create but is inserted directly and logged in without a /login round-trip.
+    """
+    user = gen_user(clean_db.db, name="user")
+    client = clean_db.test_client()
+    with client.session_transaction() as sess:
+        sess.update(
+            {"id": user.id, "nonce": generate_nonce(), "hash": hmac(user.password)}
+        )
+    return client
+
+
+@pytest.fixture
+def user_factory(clean_db):
+    """
+    Creates users with unique names and emails. Keyword arguments are passed on to gen_user
+    """
+    counter = itertools.count()
+
+    def _make(**kwargs):
+        name = "user{}".format(next(counter))
+        kwargs.setdefault("name", name)
+        kwargs.setdefault("email", name + "@examplectf.com")
+        return gen_user(clean_db.db, **kwargs)
+
+    return _make
+
+
+@pytest.fixture
+def challenge_visibility(request, clean_db):
+    """
+    Sets challenge_visibility for the test. Use with indirect parametrization
+    """
+    set_config("challenge_visibility", request.param)
+    return request.param
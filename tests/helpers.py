@@ -1,6 +1,8 @@
 import datetime
 import gc
+import os
 import random
+import sqlite3
 import string
 import uuid
 from collections import namedtuple
@@ -10,6 +12,7 @@ from unittest.mock import Mock, patch
 import requests
 from flask.testing import FlaskClient
 from freezegun import freeze_time
+from sqlalchemy import func, select
 from sqlalchemy.engine.url import make_url
 from sqlalchemy_utils import drop_database
 from werkzeug.datastructures import Headers
@@ -24,6 +27,7 @@ from CTFd.models import (
     Challenges,
     ChallengeTopics,
     Comments,
+    Configs,
     Fails,
     Fields,
     Files,
@@ -43,8 +47,10 @@ from CTFd.models import (
     Unlocks,
     UserComments,
     Users,
+    db,
 )
-from CTFd.utils import set_config
+from CTFd.utils import _get_config
+from CTFd.utils.crypto import hash_password
 from tests.constants.time import FreezeTimes
 
 text_type = str
@@ -53,10 +59,18 @@ binary_type = bytes
 
 FakeRequest = namedtuple("FakeRequest", ["form"])
 
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+# Copies of SQLite databases right after setup_ctfd() keyed by the setup arguments
+SETUP_SNAPSHOTS = {}
+
 
 class CTFdTestClient(FlaskClient):
     def open(self, *args, **kwargs):
-        if kwargs.get("json") is not None:
+        # CTFd only checks the CSRF token on state changing requests so skip the
+        # extra session round-trip needed to look up the nonce for everything else
+        method = kwargs.get("method", "GET").upper()
+        if kwargs.get("json") is not None and method not in SAFE_METHODS:
             with self.session_transaction() as sess:
                 api_key_headers = Headers({"CSRF-Token": sess.get("nonce")})
                 headers = kwargs.pop("headers", Headers())
@@ -74,12 +88,10 @@ class ctftime:
         This context manager can be used to setup start and end dates for a test CTFd
         """
         try:
-            set_config("start", FreezeTimes.START)
-            set_config("end", FreezeTimes.END)
+            set_configs(start=FreezeTimes.START, end=FreezeTimes.END)
             yield
         finally:
-            set_config("start", None)
-            set_config("end", None)
+            set_configs(start=None, end=None)
 
     @contextmanager
     def not_started():
@@ -138,25 +150,79 @@ def create_ctfd(
     config.APPLICATION_ROOT = application_root
     url = make_url(config.SQLALCHEMY_DATABASE_URI)
     if url.database:
-        url = url.set(database=str(uuid.uuid4()))
+        database = str(uuid.uuid4())
+        if url.drivername.startswith("sqlite"):
+            # Flask-SQLAlchemy resolves relative SQLite paths against the app's root path
+            # but creating and dropping the database go by the working directory
+            database = os.path.abspath(database)
+        url = url.set(database=database)
     config.SQLALCHEMY_DATABASE_URI = str(url)
 
     app = create_app(config)
     app.test_client_class = CTFdTestClient
 
     if setup:
-        app = setup_ctfd(
-            app,
-            ctf_name=ctf_name,
-            ctf_description=ctf_description,
-            name=name,
-            email=email,
-            password=password,
-            user_mode=user_mode,
-        )
+        snapshot_key = None
+        if url.get_backend_name() == "sqlite":
+            snapshot_key = (
+                config,
+                enable_plugins,
+                application_root,
+                ctf_name,
+                ctf_description,
+                name,
+                email,
+                password,
+                user_mode,
+            )
+
+        if snapshot_key in SETUP_SNAPSHOTS:
+            restore_sqlite_snapshot(app, SETUP_SNAPSHOTS[snapshot_key])
+        else:
+            app = setup_ctfd(
+                app,
+                ctf_name=ctf_name,
+                ctf_description=ctf_description,
+                name=name,
+                email=email,
+                password=password,
+                user_mode=user_mode,
+            )
+            if snapshot_key:
+                SETUP_SNAPSHOTS[snapshot_key] = take_sqlite_snapshot(app)
     return app
 
 
+def take_sqlite_snapshot(app):
+    """
+    Copy an SQLite backed CTFd database into a new in-memory database
+    """
+    snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+    with app.app_context():
+        app.db.session.remove()
+        connection = app.db.engine.raw_connection()
+        try:
+            connection.connection.backup(snapshot)
+        finally:
+            connection.close()
+    return snapshot
+
+
+def restore_sqlite_snapshot(app, snapshot):
+    """
+    Overwrite an SQLite backed CTFd database with a snapshot from take_sqlite_snapshot().
+    Much faster than running setup_ctfd() again.
+    """
+    with app.app_context():
+        app.db.session.remove()
+        connection = app.db.engine.raw_connection()
+        try:
+            snapshot.backup(connection.connection)
+        finally:
+            connection.close()
+        cache.clear()
+
+
 def setup_ctfd(
     app,
     ctf_name="CTFd",
@@ -307,6 +373,32 @@ def get_scores(user):
     return scores["data"]
 
 
+def count_rows(*models):
+    """
+    Count the rows of several models with a single query. Returns a dict keyed by model name
+    """
+    counts = select(*[select(func.count(m.id)).scalar_subquery() for m in models])
+    row = db.session.execute(counts).one()
+    return dict(zip([m.__name__ for m in models], row))
+
+
+def set_configs(**configs):
+    """
+    Same as calling set_config() for every keyword argument but with one query and one commit
+    """
+    existing = Configs.query.filter(Configs.key.in_(configs.keys())).all()
+    existing = {config.key: config for config in existing}
+    for key, value in configs.items():
+        if key in existing:
+            existing[key].value = value
+        else:
+            db.session.add(Configs(key=key, value=value))
+    db.session.commit()
+
+    for key in configs:
+        cache.delete_memoized(_get_config, key)
+
+
 def random_string(n=5):
     return "".join(
         random.choice(string.ascii_letters + string.digits) for _ in range(n)
@@ -342,6 +434,32 @@ def gen_challenge(
     return chal
 
 
+def gen_challenge_with_properties(db, flags=1, hints=1, tags=1, hint_cost=0, **kwargs):
+    """
+    Creates a challenge along with default flags, hints and tags in a single commit
+    """
+    properties = {
+        "name": "chal_name",
+        "description": "chal_description",
+        "value": 100,
+        "category": "chal_category",
+        "type": "standard",
+        "state": "visible",
+    }
+    properties.update(kwargs)
+    chal = Challenges(**properties)
+    chal.flags = [Flags(content="flag", type="static") for _ in range(flags)]
+    chal.hints = [
+        Hints(content="This is a hint", cost=hint_cost, type="standard")
+        for _ in range(hints)
+    ]
+    chal.tags = [Tags(value="tag_tag") for _ in range(tags)]
+    db.session.add(chal)
+    db.session.commit()
+    clear_challenges()
+    return chal
+
+
 def gen_award(db, user_id, team_id=None, name="award_name", value=100):
     award = Awards(user_id=user_id, team_id=team_id, name=name, value=value)
     award.date = datetime.datetime.utcnow()
@@ -399,6 +517,30 @@ def gen_user(
     return user
 
 
+def gen_users(db, count, name="user", password="password", **kwargs):
+    """
+    Creates users named <name>0 to <name><count - 1> with a single INSERT.
+    The password is hashed once and shared by every user.
+    """
+    password = hash_password(password)
+    names = [name + str(x) for x in range(count)]
+    db.session.bulk_insert_mappings(
+        Users,
+        [
+            dict(
+                name=n,
+                email=n + "@examplectf.com",
+                password=password,
+                type="user",
+                **kwargs
+            )
+            for n in names
+        ],
+    )
+    db.session.commit()
+    return Users.query.filter(Users.name.in_(names)).order_by(Users.id).all()
+
+
 def gen_team(
     db,
     name="team_name",
@@ -437,6 +579,18 @@ def gen_unlock(db, user_id, team_id=None, target=None, type="hints"):
     return unlock
 
 
+def unlock_hint(client, hint_id):
+    """
+    Views a hint, tries to unlock it and views it again.
+    Returns the three responses so callers can check the hint before and after unlocking.
+    """
+    url = "/api/v1/hints/{}".format(hint_id)
+    before = client.get(url)
+    unlock = client.post("/api/v1/unlocks", json={"target": hint_id, "type": "hints"})
+    after = client.get(url)
+    return before, unlock, after
+
+
 def gen_solve(
     db,
     user_id,
@@ -462,6 +616,29 @@ def gen_solve(
     return solve
 
 
+def gen_solves(db, pairs, ip="127.0.0.1", provided="rightkey", **kwargs):
+    """
+    Creates a solve for every (user_id, challenge_id) pair with a single commit
+    """
+    date = datetime.datetime.utcnow()
+    solves = [
+        Solves(
+            user_id=user_id,
+            challenge_id=challenge_id,
+            ip=ip,
+            provided=provided,
+            date=date,
+            **kwargs
+        )
+        for user_id, challenge_id in pairs
+    ]
+    db.session.add_all(solves)
+    db.session.commit()
+    clear_standings()
+    clear_challenges()
+    return solves
+
+
 def gen_fail(
     db,
     user_id,
@@ -561,6 +738,98 @@ def gen_field(
     return field
 
 
+def gen_fields(db, fields, type="user"):
+    """
+    Create several fields in one commit. Each entry is a dict of gen_field keyword arguments
+    """
+    defaults = {
+        "type": type,
+        "field_type": "text",
+        "description": "CustomFieldDescription",
+        "required": True,
+        "public": True,
+        "editable": True,
+    }
+    fields = [Fields(**dict(defaults, **field)) for field in fields]
+    db.session.add_all(fields)
+    db.session.commit()
+    return fields
+
+
+def gen_reset_data(db, count=10, page_files=5, page_id=1):
+    """
+    Populate the tables cleared by the admin reset in a single transaction.
+    Each user gets an award, a solve, a fail and a tracking entry and each challenge
+    gets a flag, a hint and a file. Returns the created challenges and users.
+    """
+    date = datetime.datetime.utcnow()
+    challenges = [
+        Challenges(
+            name="chal_name{}".format(x),
+            description="chal_description",
+            value=100,
+            category="chal_category",
+            type="standard",
+            state="visible",
+        )
+        for x in range(count)
+    ]
+    users = [
+        Users(
+            name="user{}".format(x),
+            email="user{}@examplectf.com".format(x),
+            password="password",
+        )
+        for x in range(count)
+    ]
+    db.session.add_all(challenges + users)
+    db.session.flush()
+
+    rows = []
+    for chal in challenges:
+        rows.append(Flags(challenge_id=chal.id, content="flag", type="static"))
+        rows.append(Hints(challenge_id=chal.id, content="This is a hint", cost=0))
+        rows.append(
+            ChallengeFiles(
+                challenge_id=chal.id,
+                location="{name}/{name}.file".format(name=chal.name),
+            )
+        )
+    for user in users:
+        rows.append(Awards(user_id=user.id, name="award_name", value=100, date=date))
+        rows.append(
+            Solves(
+                user_id=user.id,
+                challenge_id=random.choice(challenges).id,
+                ip="127.0.0.1",
+                provided="rightkey",
+                date=date,
+            )
+        )
+        rows.append(
+            Fails(
+                user_id=user.id,
+                challenge_id=random.choice(challenges).id,
+                ip="127.0.0.1",
+                provided="wrongkey",
+                date=date,
+            )
+        )
+        rows.append(Tracking(ip="127.0.0.1", user_id=user.id))
+    for x in range(page_files):
+        rows.append(
+            PageFiles(
+                page_id=page_id,
+                location="page_file{name}/page_file{name}.file".format(name=x),
+            )
+        )
+    db.session.add_all(rows)
+    db.session.commit()
+    clear_standings()
+    clear_challenges()
+    return challenges, users
+
+
 def simulate_user_activity(db, user):
     gen_tracking(db, user_id=user.id)
     gen_award(db, user_id=user.id)
@@ -13,7 +13,7 @@ from tests.helpers import (
     gen_flag,
     gen_hint,
     gen_team,
-    gen_user,
+    gen_users,
     login_as_user,
     register_user,
 )
@@ -57,11 +57,7 @@ def test_import_ctf():
     app = create_ctfd()
     if not app.config.get("SQLALCHEMY_DATABASE_URI").startswith("sqlite"):
         with app.app_context():
-            base_user = "user"
-            for x in range(10):
-                user = base_user + str(x)
-                user_email = user + "@examplectf.com"
-                gen_user(app.db, name=user, email=user_email)
+            gen_users(app.db, 10)
 
             base_team = "team"
             for x in range(5):
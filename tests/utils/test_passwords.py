@@ -1,5 +1,10 @@
+import pytest
+
 from CTFd.utils.crypto import hash_password, sha256, verify_password
 
+# These check real bcrypt hashes so they can't use the cheaper test hasher
+pytestmark = pytest.mark.usefixtures("real_password_hashing")
+
 
 def test_hash_password():
     assert hash_password("asdf").startswith("$bcrypt-sha256")